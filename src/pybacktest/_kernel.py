@@ -0,0 +1,178 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:  # numba is optional; the NumPy fallback below is used
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True)
+    def _replay(
+        act_day, act_ticker, act_kind, act_qty, act_price, n_days, n_tickers, initial_cash
+    ):
+        """Sequential tape replay: per-day share counts and cash."""
+        counts_per_day = np.zeros((n_days, n_tickers), dtype=np.float64)
+        cash_per_day = np.empty(n_days, dtype=np.float64)
+        counts = np.zeros(n_tickers, dtype=np.float64)
+        cash = initial_cash
+        a = 0
+        for day in range(n_days):
+            while a < act_day.size and act_day[a] == day:
+                quantity = act_qty[a]
+                price = act_price[a]
+                if act_kind[a] == 0:  # sell
+                    counts[act_ticker[a]] -= quantity
+                    cash += quantity * price
+                else:  # buy
+                    counts[act_ticker[a]] += quantity
+                    cash -= quantity * price
+                a += 1
+            for ticker in range(n_tickers):
+                counts_per_day[day, ticker] = counts[ticker]
+            cash_per_day[day] = cash
+        return counts_per_day, cash_per_day
+
+    @njit(cache=True)
+    def sma_cross(close, short_window, long_window):
+        """
+        Crossover signal per bar via running sums: +1 while the short SMA
+        is above the long SMA, -1 while below, 0 before the long window
+        fills. One add and one subtract per step instead of re-averaging.
+        """
+        n = close.size
+        signals = np.zeros(n, dtype=np.int8)
+        short_sum = 0.0
+        long_sum = 0.0
+        for i in range(n):
+            short_sum += close[i]
+            long_sum += close[i]
+            if i >= short_window:
+                short_sum -= close[i - short_window]
+            if i >= long_window:
+                long_sum -= close[i - long_window]
+            if i >= long_window - 1:
+                short_sma = short_sum / short_window
+                long_sma = long_sum / long_window
+                if short_sma > long_sma:
+                    signals[i] = 1
+                elif short_sma < long_sma:
+                    signals[i] = -1
+        return signals
+
+    @njit(parallel=True, cache=True)
+    def _values(prices, counts_per_day, cash_per_day):
+        """Per-day valuation; order-independent, so days run in parallel."""
+        n_days, n_tickers = counts_per_day.shape
+        values = np.empty(n_days, dtype=np.float64)
+        for day in prange(n_days):
+            total = 0.0
+            for ticker in range(n_tickers):
+                total += counts_per_day[day, ticker] * prices[day, ticker]
+            values[day] = cash_per_day[day] + total
+        return values
+
+    def simulate(
+        prices,
+        act_day,
+        act_ticker,
+        act_kind,
+        act_qty,
+        act_price,
+        n_days,
+        n_tickers,
+        initial_cash,
+    ):
+        """
+        Replay an executed-action tape over the price matrix.
+
+        :param prices: (n_days, n_tickers) forward-filled Close prices
+        :param act_day: day index of each action, sorted ascending
+        :param act_ticker: ticker index of each action
+        :param act_kind: ActionKind code, 0 for sell, 1 for buy
+        :param act_qty: executed quantity of each action
+        :param act_price: executed price of each action
+        :return: (portfolio value per day, final share counts)
+        """
+        if n_days == 0:
+            return (
+                np.empty(0, dtype=np.float64),
+                np.zeros(n_tickers, dtype=np.float64),
+            )
+        counts_per_day, cash_per_day = _replay(
+            act_day, act_ticker, act_kind, act_qty, act_price,
+            n_days, n_tickers, initial_cash,
+        )
+        return _values(prices, counts_per_day, cash_per_day), counts_per_day[-1]
+
+else:
+
+    def sma_cross(close, short_window, long_window):
+        """
+        Crossover signal per bar: +1 while the short SMA is above the long
+        SMA, -1 while below, 0 before the long window fills. NumPy
+        fallback built on one cumulative sum per window.
+        """
+        n = close.size
+        signals = np.zeros(n, dtype=np.int8)
+        if n < long_window:
+            return signals
+        cumulative = np.cumsum(close)
+
+        def sma(window):
+            out = np.full(n, np.nan)
+            out[window - 1 :] = (
+                cumulative[window - 1 :]
+                - np.concatenate(([0.0], cumulative[:-window]))
+            ) / window
+            return out
+
+        short_sma = sma(short_window)
+        long_sma = sma(long_window)
+        valid = ~np.isnan(short_sma) & ~np.isnan(long_sma)
+        signals[valid & (short_sma > long_sma)] = 1
+        signals[valid & (short_sma < long_sma)] = -1
+        return signals
+
+    def simulate(
+        prices,
+        act_day,
+        act_ticker,
+        act_kind,
+        act_qty,
+        act_price,
+        n_days,
+        n_tickers,
+        initial_cash,
+    ):
+        """
+        Replay an executed-action tape over the price matrix.
+
+        NumPy fallback: scatter the per-day deltas with np.add.at, cumsum
+        them into running counts/cash, and value all days in one pass.
+
+        :param prices: (n_days, n_tickers) forward-filled Close prices
+        :param act_day: day index of each action, sorted ascending
+        :param act_ticker: ticker index of each action
+        :param act_kind: ActionKind code, 0 for sell, 1 for buy
+        :param act_qty: executed quantity of each action
+        :param act_price: executed price of each action
+        :return: (portfolio value per day, final share counts)
+        """
+        if n_days == 0:
+            return (
+                np.empty(0, dtype=np.float64),
+                np.zeros(n_tickers, dtype=np.float64),
+            )
+        sign = np.where(act_kind == 0, -1.0, 1.0)
+        count_delta = np.zeros((n_days, n_tickers), dtype=np.float64)
+        np.add.at(count_delta, (act_day, act_ticker), sign * act_qty)
+        counts_per_day = count_delta.cumsum(axis=0)
+        cash_delta = np.zeros(n_days, dtype=np.float64)
+        np.add.at(cash_delta, act_day, -sign * act_qty * act_price)
+        cash_per_day = initial_cash + cash_delta.cumsum()
+        values = cash_per_day + (counts_per_day * prices).sum(axis=1)
+        return values, counts_per_day[-1]
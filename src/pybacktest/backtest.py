@@ -1,15 +1,68 @@
-import math
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
 import warnings
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from functools import lru_cache, reduce
 from typing import List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from pybacktest.models import Action, Portfolio, Stock
+from pybacktest._kernel import simulate
+from pybacktest.models import Action, ActionKind, Portfolio, Stock
 from pybacktest.strategy import StrategyManager
 
 
+logger = logging.getLogger(__name__)
+
+# column order of the per-bar tensor built by _build_price_matrix
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Change", "Change_Pct")
+
+
+@lru_cache(maxsize=4096)
+def _to_ts(date: str) -> pd.Timestamp:
+    """Cached date-string parse; parsing is hot when callers pass strings."""
+    return pd.Timestamp(date)
+
+
+def _run_backtest_worker(backtest):
+    """Run one pickled Backtest in a worker process and ship it back."""
+    backtest.run()
+    return backtest
+
+
+def _run_strategy_worker(args):
+    """Run one strategy of a pre-pickled Backtest and ship its results back."""
+    blob, shm_name, bars_shape, bars_dtype, strategy_index, run_dates = args
+    backtest = pickle.loads(blob)
+    # reattach the shared price tensor; the blob carries only its name
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        backtest._bars = np.ndarray(bars_shape, dtype=bars_dtype, buffer=shm.buf)
+        backtest._prices = backtest._bars[:, :, BAR_COLUMNS.index("Close")]
+        strategy = backtest.strategies[strategy_index]
+        backtest.daily_snapshots = []
+        backtest._run_one_strategy(strategy, run_dates)
+        return (
+            backtest.trades[strategy],
+            backtest.value_over_time_arr[
+                backtest._strategy_idx[strategy], : len(run_dates)
+            ].copy(),
+            backtest.daily_snapshots,
+            backtest.portfolio,
+        )
+    finally:
+        # drop the views before closing, or close() raises BufferError
+        backtest._bars = None
+        backtest._prices = None
+        shm.close()
+
+
 class Backtest:
     def __init__(
         self,
@@ -22,11 +75,141 @@ class Backtest:
         self.initial_capital = initial_capital
         self.trades = defaultdict(list)
         self.dates = self.get_common_dates()
-        self.value_over_time = defaultdict(dict)
-        self.daily_snapshots = []  # To store daily portfolio state
+        # contiguous (strategy, day) value matrix; value_over_time below
+        # rebuilds the Timestamp-keyed dict view for older callers
+        self.value_over_time_arr = np.full(
+            (len(strategies), len(self.dates)), np.nan, dtype=np.float64
+        )
+        self._strategy_idx = {strategy: i for i, strategy in enumerate(strategies)}
+        self._run_length = 0
+        # daily portfolio state as preallocated column arrays (one slot
+        # per recorded bar); daily_snapshots below rebuilds the old
+        # list-of-dicts view for callers that still want it
+        capacity = max(1, len(self.dates) * max(1, len(strategies)))
+        self._snap_len = 0
+        self._snap_dates = np.empty(capacity, dtype="datetime64[ns]")
+        self._snap_cash = np.empty(capacity, dtype=np.float64)
+        self._snap_total = np.empty(capacity, dtype=np.float64)
+        self._snap_amounts = np.empty((capacity, len(stocks)), dtype=np.int64)
+        self._snap_values = np.empty((capacity, len(stocks)), dtype=np.float64)
+        self._snapshots_rev = 0
+        self._monthly_cache = (None, -1)  # (frame, revision it was built at)
+        self._equity_cache = {}  # (strategy row, run length) -> Series
         self.portfolio: Portfolio = Portfolio(
             initial_capital, [stock.ticker for stock in stocks]
         )
+        self._build_price_matrix()
+
+    def _price_cache_path(self) -> Optional[str]:
+        """
+        Cache file for the price matrix, or None when caching does not
+        apply (only yfinance-fetched stocks have reproducible data).
+
+        The key hashes the frame contents, not just tickers and dates:
+        yfinance revises auto-adjusted history retroactively on every
+        dividend/split, and a ticker/date match alone would keep serving
+        a bars tensor that disagrees with the frames the strategies
+        trade on. Revised data simply misses and rebuilds.
+        """
+        if not self.stocks or not all(stock.fetched for stock in self.stocks):
+            return None
+        cache_dir = os.environ.get(
+            "PYBACKTEST_CACHE_DIR",
+            os.path.join(os.path.expanduser("~"), ".cache", "pybacktest"),
+        )
+        key_hash = hashlib.sha1(
+            repr(
+                (
+                    tuple(sorted(stock.ticker for stock in self.stocks)),
+                    min(stock.start for stock in self.stocks),
+                    max(stock.end for stock in self.stocks),
+                )
+            ).encode()
+        )
+        for stock in self.stocks:
+            for column in BAR_COLUMNS:
+                if column in stock.data.columns:
+                    key_hash.update(
+                        stock.data[column].to_numpy(dtype=np.float64).tobytes()
+                    )
+        return os.path.join(cache_dir, f"bars_{key_hash.hexdigest()}.npz")
+
+    def _build_price_matrix(self):
+        """
+        Precompute a (days, stocks, columns) forward-filled bar tensor so
+        per-bar reads are O(1) indexing instead of per-stock pandas
+        slicing; _prices is the Close plane of it, keeping portfolio
+        valuation a single row lookup + dot product.
+        """
+        self._stock_by_ticker = {stock.ticker: stock for stock in self.stocks}
+        self._ticker_idx = {stock.ticker: i for i, stock in enumerate(self.stocks)}
+        self._date_idx = {date: i for i, date in enumerate(self.dates)}
+        self._bar_col_idx = {column: j for j, column in enumerate(BAR_COLUMNS)}
+        close_plane = self._bar_col_idx["Close"]
+        cache_path = self._price_cache_path()
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                cached = np.load(cache_path, allow_pickle=False)
+                if list(cached["tickers"]) == [
+                    stock.ticker for stock in self.stocks
+                ] and np.array_equal(cached["dates"], self.dates.values):
+                    self._bars = cached["bars"]
+                    self._prices = self._bars[:, :, close_plane]
+                    return
+            except (OSError, KeyError, ValueError):
+                pass  # unreadable cache entry; rebuild below
+        self._bars = np.full(
+            (len(self.dates), len(self.stocks), len(BAR_COLUMNS)),
+            np.nan,
+            dtype=np.float64,
+        )
+        for i, stock in enumerate(self.stocks):
+            for column, j in self._bar_col_idx.items():
+                if column in stock.data.columns:
+                    self._bars[:, i, j] = (
+                        stock.data[column]
+                        .reindex(self.dates)
+                        .ffill()
+                        .to_numpy(dtype=np.float64)
+                    )
+        self._prices = self._bars[:, :, close_plane]
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                np.savez(
+                    cache_path,
+                    tickers=np.array([stock.ticker for stock in self.stocks]),
+                    dates=self.dates.values,
+                    bars=self._bars,
+                )
+            except OSError:
+                pass  # cache directory not writable; keep going uncached
+
+    def bar_values(self, date, column: str = "Close") -> Optional[np.ndarray]:
+        """
+        Forward-filled values of one bar column for every stock at a date.
+
+        :param date: date to look up
+        :param column: one of BAR_COLUMNS
+        :type column: str
+        :return: per-stock values aligned with self.stocks, None before
+            the first common date
+        :rtype: Optional[np.ndarray]
+        """
+        ts = date if isinstance(date, pd.Timestamp) else _to_ts(date)
+        idx = self._price_row_index(ts)
+        if idx is None:
+            return None
+        return self._bars[idx, :, self._bar_col_idx[column]]
+
+    def _price_row_index(self, date: pd.Timestamp) -> Optional[int]:
+        """asof-style row index for a date: exact match or last earlier date."""
+        idx = self._date_idx.get(date)
+        if idx is None:
+            idx = int(np.searchsorted(self.dates, date, side="right")) - 1
+            if idx < 0:
+                return None
+        return idx
 
     def get_protfolio_value(self, date: str) -> float:
         """
@@ -37,17 +220,19 @@ class Backtest:
         :return: total portfolio value at the given date
         :rtype: float
         """
-        total_value = self.portfolio.cash
-        for stock in self.stocks:
-            if stock.ticker in self.portfolio.tickers:
-                if pd.to_datetime(date) not in stock.data.index.to_list():
-                    stock.data.loc[pd.to_datetime(date)] = None
-                    stock.data.sort_index(inplace=True, ascending=True)
-                total_value += (
-                    self.portfolio.stock_count[stock.ticker]
-                    * stock.data.asof(pd.to_datetime(date))["Close"]
-                )
-        return total_value
+        ts = date if isinstance(date, pd.Timestamp) else _to_ts(date)
+        return self._portfolio_value_at_index(self._price_row_index(ts))
+
+    def _portfolio_value_at_index(self, idx: Optional[int]) -> float:
+        """cash + counts @ prices[idx] without any date parsing."""
+        if idx is None:
+            return self.portfolio.cash
+        counts = np.fromiter(
+            (self.portfolio.stock_count[stock.ticker] for stock in self.stocks),
+            dtype=np.float64,
+            count=len(self.stocks),
+        )
+        return self.portfolio.cash + float(counts @ self._prices[idx])
 
     def get_common_dates(self) -> pd.DatetimeIndex:
         """
@@ -57,69 +242,351 @@ class Backtest:
         :return: common dates across all stocks
         :rtype: DatetimeIndex
         """
-        common_dates = set(self.stocks[0].data.index)
-        for stock in self.stocks[1:]:
-            common_dates = common_dates.intersection(set(stock.data.index))
-        return pd.DatetimeIndex(sorted(common_dates))
+        # np.intersect1d on the raw index values avoids boxing every
+        # Timestamp into a Python set and returns sorted output
+        common_dates = reduce(
+            np.intersect1d, (stock.data.index.values for stock in self.stocks)
+        )
+        return pd.DatetimeIndex(common_dates)
+
+    @classmethod
+    def run_many(
+        cls, backtests: List["Backtest"], workers: Optional[int] = None
+    ) -> List["Backtest"]:
+        """
+        Run independent backtests in parallel worker processes.
+
+        Each instance is pickled into its own process (no shared state),
+        run to completion, and shipped back, so parameter sweeps scale
+        with core count. Closure-based Strategy objects cannot pickle;
+        use StrategyManager strategies for parallel sweeps.
 
-    def run(self, end_date: str = None):
+        :param backtests: backtests to run; each is run with defaults
+        :type backtests: List[Backtest]
+        :param workers: worker process count, defaults to the executor's
+        :type workers: Optional[int]
+        :return: the finished backtests, in input order
+        :rtype: List[Backtest]
+        """
+        if len(backtests) <= 1 or (workers is not None and workers <= 1):
+            for backtest in backtests:
+                backtest.run()
+            return backtests
+        # fork shares loaded pages with the workers where available;
+        # elsewhere (e.g. Windows) the default spawn context works too,
+        # since the payloads are fully pickled either way
+        context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(_run_backtest_worker, backtests))
+
+    def run(self, end_date: str = None, parallel: bool = False):
         """
             :param self: self
         :param end_date: ending date in 'YYYY-MM-DD' format if specified, otherwise runs till the last date available
         :type end_date: str
+        :param parallel: run each strategy in its own worker process
+        :type parallel: bool
         '''"""
-        print("Start Runing Backtest!")
+        logger.info("Start Runing Backtest!")
+        self._equity_cache = {}
         if end_date:
             run_dates = self.dates[self.dates <= pd.to_datetime(end_date)]
         else:
             run_dates = self.dates
-        for strategy in self.strategies:
-            self.portfolio = Portfolio(
-                self.initial_capital, [stock.ticker for stock in self.stocks]
+        if parallel and len(self.strategies) > 1:
+            self._run_parallel(run_dates)
+        else:
+            for strategy in self.strategies:
+                self._run_one_strategy(strategy, run_dates)
+        logger.info("Ended Running Backtest!")
+
+    def _run_one_strategy(self, strategy: StrategyManager, run_dates):
+        self.portfolio.reset(self.initial_capital)
+        self.trades[strategy] = []
+        if getattr(strategy, "vectorize", None) is not None:
+            self._run_vectorized(strategy, run_dates)
+            return
+        for date in run_dates:
+            stock_data = [stock.cut_data(stock.start, date) for stock in self.stocks]
+            actions = strategy.apply(self.portfolio, stock_data, date)
+            self.execute_action(actions, date, strategy)
+            self.record_daily_snapshot(date)
+        self._fill_value_over_time(strategy, run_dates)
+
+    def _run_vectorized(self, strategy, run_dates):
+        """
+        Fast path for strategies that can emit their whole signal series
+        up front: one accounting sweep over precomputed signal arrays, no
+        per-bar cut_data slices or Action objects.
+        """
+        trades = self.trades[strategy]
+        signals = {}
+        for stock in self.stocks:
+            signal = strategy.vectorize(stock)
+            if signal is None:
+                continue
+            aligned = (
+                pd.Series(signal, index=stock.data.index)
+                .reindex(run_dates)
+                .fillna(0)
+                .to_numpy()
             )
-            for date in run_dates:
-                stock_data = [
-                    stock.cut_data(stock.start, date) for stock in self.stocks
-                ]
-                actions = strategy.apply(self.portfolio, stock_data, date)
-                self.execute_action(actions, date, strategy)
-                self.value_over_time[strategy][date] = self.get_protfolio_value(date)
-                self.record_daily_snapshot(date)
-        print("Ended Running Backtest!")
+            signals[self._ticker_idx[stock.ticker]] = aligned
+        for day, date in enumerate(run_dates):
+            for ticker_i, signal in signals.items():
+                price = self._prices[day, ticker_i]
+                if np.isnan(price):
+                    continue
+                ticker = self.stocks[ticker_i].ticker
+                holding = self.portfolio.stock_count[ticker]
+                if signal[day] > 0 and holding == 0:
+                    quantity = int(self.portfolio.cash // price)
+                    if quantity > 0:
+                        self.portfolio.update(ticker, quantity, price)
+                        trades.append(
+                            {
+                                "date": date,
+                                "ticker": ticker,
+                                "type": "buy",
+                                "quantity": quantity,
+                                "price": price,
+                            }
+                        )
+                elif signal[day] < 0 and holding > 0:
+                    self.portfolio.update(ticker, -holding, price)
+                    trades.append(
+                        {
+                            "date": date,
+                            "ticker": ticker,
+                            "type": "sell",
+                            "quantity": int(holding),
+                            "price": price,
+                        }
+                    )
+            self.record_daily_snapshot(date)
+        self._fill_value_over_time(strategy, run_dates)
 
-    def record_daily_snapshot(self, date: pd.Timestamp):
-        snapshot = {
-            "date": date,
-            "Cash": self.portfolio.cash,
-            "Total_Value": self.get_protfolio_value(date.strftime("%Y-%m-%d")),
+    def _run_parallel(self, run_dates):
+        """
+        Dispatch each strategy to its own process; strategies are
+        independent (each owns a fresh Portfolio), so this is an
+        embarrassingly parallel split along the strategy axis.
+        """
+        context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        max_workers = min(len(self.strategies), os.cpu_count() or 1)
+        # publish the price tensor once through shared memory so each
+        # worker maps it instead of receiving a float64 copy, and
+        # serialize the rest of self (stocks, configs) once into a blob
+        # shared by every task instead of letting the executor re-pickle
+        # self per strategy
+        bars, prices = self._bars, self._prices
+        shm = shared_memory.SharedMemory(create=True, size=max(bars.nbytes, 1))
+        shm_view = np.ndarray(bars.shape, dtype=bars.dtype, buffer=shm.buf)
+        shm_view[:] = bars
+        self._bars = None
+        self._prices = None
+        try:
+            blob = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            self._bars, self._prices = bars, prices
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=context
+            ) as pool:
+                results = list(
+                    pool.map(
+                        _run_strategy_worker,
+                        [
+                            (blob, shm.name, bars.shape, bars.dtype, i, run_dates)
+                            for i in range(len(self.strategies))
+                        ],
+                    )
+                )
+        finally:
+            del shm_view
+            shm.close()
+            shm.unlink()
+        self._run_length = len(run_dates)
+        for strategy, result in zip(self.strategies, results):
+            trades, values, snapshots, portfolio = result
+            self.trades[strategy] = trades
+            self.value_over_time_arr[
+                self._strategy_idx[strategy], : len(run_dates)
+            ] = values
+            self._append_snapshots(snapshots)
+            self.portfolio = portfolio
+
+    @property
+    def value_over_time(self):
+        """
+        Timestamp-keyed {strategy: {date: value}} view rebuilt on demand;
+        hot paths read value_over_time_arr directly.
+        """
+        dates = self.dates[: self._run_length]
+        return {
+            strategy: dict(
+                zip(dates, self.value_over_time_arr[row, : self._run_length].tolist())
+            )
+            for strategy, row in self._strategy_idx.items()
         }
-        for ticker in self.portfolio.tickers:
-            snapshot[f"Stock_Amount_{ticker}"] = self.portfolio.stock_count[ticker]
-            # Calculate stock value. Need to get current price.
-            # Assuming get_protfolio_value logic or similar can be used,
-            # but simpler here since we are inside loop or can access stock data.
-            # Using stock.data directly might be slow if we search it every time.
-            # Optimizing for now: reusing price fetching logic or cache?
-            # Re-using logic from get_protfolio_value essentially.
-            for stock in self.stocks:
-                if stock.ticker == ticker:
-                    if pd.to_datetime(date) in stock.data.index:
-                        price = stock.data.loc[pd.to_datetime(date)]["Close"]
-                        snapshot[f"Stock_Value_{ticker}"] = (
-                            self.portfolio.stock_count[ticker] * price
-                        )
-                    else:
-                        snapshot[f"Stock_Value_{ticker}"] = 0  # Or prev close?
-        self.daily_snapshots.append(snapshot)
+
+    def equity_curve(self, strategy=None) -> pd.Series:
+        """
+        Daily portfolio values of a run as an O(1)-indexable Series.
+
+        :param strategy: strategy to read, defaults to the first one
+        :return: values keyed by trading date, empty before run()
+        :rtype: pd.Series
+        """
+        if strategy is None:
+            strategy = self.strategies[0]
+        row = self._strategy_idx[strategy]
+        n = self._run_length
+        # memoized per run so repeated lookups (e.g. a UI slider) skip
+        # the Series construction
+        series = self._equity_cache.get((row, n))
+        if series is None:
+            series = pd.Series(
+                self.value_over_time_arr[row, :n], index=self.dates[:n]
+            )
+            self._equity_cache[(row, n)] = series
+        return series
+
+    def _fill_value_over_time(self, strategy: StrategyManager, run_dates):
+        """
+        Rebuild the daily portfolio values for one strategy in a single
+        kernel pass over the executed trades instead of a per-day valuation.
+        """
+        trades = self.trades[strategy]
+        act_day = np.empty(len(trades), dtype=np.int64)
+        act_ticker = np.empty(len(trades), dtype=np.int64)
+        act_kind = np.empty(len(trades), dtype=np.int64)
+        act_qty = np.empty(len(trades), dtype=np.float64)
+        act_price = np.empty(len(trades), dtype=np.float64)
+        for i, trade in enumerate(trades):
+            act_day[i] = self._date_idx[trade["date"]]
+            act_ticker[i] = self._ticker_idx[trade["ticker"]]
+            act_kind[i] = (
+                ActionKind.SELL if trade["type"] == "sell" else ActionKind.BUY
+            )
+            act_qty[i] = trade["quantity"]
+            act_price[i] = trade["price"]
+        values, _ = simulate(
+            self._prices[: len(run_dates)],
+            act_day,
+            act_ticker,
+            act_kind,
+            act_qty,
+            act_price,
+            len(run_dates),
+            len(self.stocks),
+            self.initial_capital,
+        )
+        row = self._strategy_idx[strategy]
+        self.value_over_time_arr[row, : len(run_dates)] = values
+        self._run_length = len(run_dates)
+
+    @property
+    def daily_snapshots(self) -> List[dict]:
+        """Recorded snapshots materialized as the old list-of-dicts view."""
+        tickers = self.portfolio.tickers
+        snapshots = []
+        for i in range(self._snap_len):
+            snapshot = {
+                "date": pd.Timestamp(self._snap_dates[i]),
+                "Cash": float(self._snap_cash[i]),
+                "Total_Value": float(self._snap_total[i]),
+            }
+            for j, ticker in enumerate(tickers):
+                snapshot[f"Stock_Amount_{ticker}"] = int(self._snap_amounts[i, j])
+                snapshot[f"Stock_Value_{ticker}"] = float(self._snap_values[i, j])
+            snapshots.append(snapshot)
+        return snapshots
+
+    @daily_snapshots.setter
+    def daily_snapshots(self, snapshots) -> None:
+        self._snap_len = 0
+        if snapshots:
+            self._append_snapshots(snapshots)
+
+    def _grow_snapshots(self) -> None:
+        """Double the snapshot buffers (run() called past initial sizing)."""
+        self._snap_dates = np.concatenate(
+            [self._snap_dates, np.empty_like(self._snap_dates)]
+        )
+        self._snap_cash = np.concatenate(
+            [self._snap_cash, np.empty_like(self._snap_cash)]
+        )
+        self._snap_total = np.concatenate(
+            [self._snap_total, np.empty_like(self._snap_total)]
+        )
+        self._snap_amounts = np.concatenate(
+            [self._snap_amounts, np.empty_like(self._snap_amounts)], axis=0
+        )
+        self._snap_values = np.concatenate(
+            [self._snap_values, np.empty_like(self._snap_values)], axis=0
+        )
+
+    def _append_snapshots(self, snapshots: List[dict]) -> None:
+        """Replay dict snapshots (e.g. shipped back by a worker) into the buffers."""
+        tickers = self.portfolio.tickers
+        for snapshot in snapshots:
+            i = self._snap_len
+            if i == len(self._snap_cash):
+                self._grow_snapshots()
+            self._snap_dates[i] = snapshot["date"]
+            self._snap_cash[i] = snapshot["Cash"]
+            self._snap_total[i] = snapshot["Total_Value"]
+            for j, ticker in enumerate(tickers):
+                self._snap_amounts[i, j] = snapshot.get(f"Stock_Amount_{ticker}", 0)
+                self._snap_values[i, j] = snapshot.get(f"Stock_Value_{ticker}", 0.0)
+            self._snap_len = i + 1
+            self._snapshots_rev += 1
+
+    def record_daily_snapshot(self, date: pd.Timestamp):
+        i = self._snap_len
+        if i == len(self._snap_cash):
+            self._grow_snapshots()
+        idx = self._date_idx.get(date)
+        self._snap_dates[i] = date
+        self._snap_cash[i] = self.portfolio.cash
+        self._snap_total[i] = self._portfolio_value_at_index(
+            idx if idx is not None else self._price_row_index(date)
+        )
+        self._snap_amounts[i] = self.portfolio.counts
+        if idx is not None:
+            self._snap_values[i] = self.portfolio.counts * self._prices[idx]
+        else:
+            self._snap_values[i] = 0.0  # Or prev close?
+        self._snap_len = i + 1
+        self._snapshots_rev += 1
 
     def get_monthly_snapshots(self) -> pd.DataFrame:
-        if not self.daily_snapshots:
+        n = self._snap_len
+        if n == 0:
             return pd.DataFrame()
-        df = pd.DataFrame(self.daily_snapshots)
-        df["date"] = pd.to_datetime(df["date"])
-        df.set_index("date", inplace=True)
-        # Resample to month end, taking the last value
-        monthly_df = df.resample("ME").last()
+        # reuse the last frame unless new snapshots were recorded since
+        cached_df, cached_rev = self._monthly_cache
+        if cached_rev == self._snapshots_rev:
+            return cached_df
+        # one frame straight off the column buffers, no per-row dicts
+        columns = {"Cash": self._snap_cash[:n], "Total_Value": self._snap_total[:n]}
+        for j, ticker in enumerate(self.portfolio.tickers):
+            columns[f"Stock_Amount_{ticker}"] = self._snap_amounts[:n, j]
+            columns[f"Stock_Value_{ticker}"] = self._snap_values[:n, j]
+        df = pd.DataFrame(
+            columns, index=pd.DatetimeIndex(self._snap_dates[:n], name="date")
+        )
+        # integer-period bucketing instead of resample's month-end
+        # offset alignment; index mapped back to month-end stamps
+        monthly_df = df.groupby(df.index.to_period("M")).last()
+        monthly_df.index = monthly_df.index.to_timestamp(how="end").normalize()
+        monthly_df.index.name = "date"
+        self._monthly_cache = (monthly_df, self._snapshots_rev)
         return monthly_df
 
     def execute_action(
@@ -137,9 +604,9 @@ class Backtest:
         for action in actions:
             if action.quantity <= 0:
                 continue
-            if action.type == "sell":
+            if action.kind == ActionKind.SELL:
                 sells.append(action)
-            elif action.type == "buy":
+            else:
                 buys.append(action)
 
         # 1. Execute Sells first
@@ -164,7 +631,13 @@ class Backtest:
         if not buys:
             return
 
-        total_buy_cost = sum(action.price * action.quantity for action in buys)
+        buy_prices = np.fromiter(
+            (action.price for action in buys), dtype=np.float64, count=len(buys)
+        )
+        buy_qtys = np.fromiter(
+            (action.quantity for action in buys), dtype=np.float64, count=len(buys)
+        )
+        total_buy_cost = float(buy_prices @ buy_qtys)
         available_cash = self.portfolio.cash
 
         ratio = 1.0
@@ -177,12 +650,13 @@ class Backtest:
             warnings.warn(f"No cash available on {date} to process buy orders.")
             return
 
-        for action in buys:
-            # Scale quantity if needed
-            quantity_to_buy = math.floor(action.quantity * ratio)
-
+        # Scale all quantities in one pass instead of math.floor per action
+        scaled_qtys = np.floor(buy_qtys * ratio).astype(np.int64)
+        costs = scaled_qtys * buy_prices
+        for action, quantity_to_buy, cost in zip(
+            buys, scaled_qtys.tolist(), costs.tolist()
+        ):
             if quantity_to_buy > 0:
-                cost = quantity_to_buy * action.price
                 # Double check cash (floating point issues or floor might leave tiny gap, usually fine since we floored)
                 if self.portfolio.cash >= cost:
                     self.portfolio.update(action.ticker, quantity_to_buy, action.price)
@@ -201,6 +675,20 @@ class Backtest:
                         f"Skipping buy for {action.ticker}: Cash check failed after scaling."
                     )
 
+    def _scatter_trades(self, strategy: StrategyManager):
+        """One scatter artist per trade side instead of one per trade."""
+        import matplotlib.pyplot as plt
+
+        trades = self.trades[strategy]
+        if not trades:
+            return
+        row = self.value_over_time_arr[self._strategy_idx[strategy]]
+        dates = np.array([trade["date"] for trade in trades])
+        values = np.array([row[self._date_idx[trade["date"]]] for trade in trades])
+        buy_mask = np.array([trade["type"] == "buy" for trade in trades])
+        plt.scatter(dates[buy_mask], values[buy_mask], color="g", marker="^")
+        plt.scatter(dates[~buy_mask], values[~buy_mask], color="r", marker="v")
+
     def plot_performance(
         self,
         figsize: Tuple[int, int] = (14, 7),
@@ -221,22 +709,20 @@ class Backtest:
         :param instance_show: If False do not show plot when function ended
         :type instance_show: bool
         """
+        # imported here so headless runs never pay the matplotlib import
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=figsize)
         if not subplot:
             for strategy in self.strategies:
-                dates = list(self.value_over_time[strategy].keys())
-                values = list(self.value_over_time[strategy].values())
+                dates = self.dates[: self._run_length]
+                values = self.value_over_time_arr[
+                    self._strategy_idx[strategy], : self._run_length
+                ]
                 plt.plot(dates, values, label=strategy.get_name())
 
                 if show_trades:
-                    for trade in self.trades[strategy]:
-                        color = "g" if trade["type"] == "buy" else "r"
-                        plt.scatter(
-                            trade["date"],
-                            self.value_over_time[strategy][trade["date"]],
-                            color=color,
-                            marker="^" if trade["type"] == "buy" else "v",
-                        )
+                    self._scatter_trades(strategy)
 
             plt.title("Portfolio Value Over Time")
             plt.xlabel("Date")
@@ -246,19 +732,14 @@ class Backtest:
         else:
             for i, strategy in enumerate(self.strategies):
                 plt.subplot(subplot[0], subplot[1], i + 1)
-                dates = list(self.value_over_time[strategy].keys())
-                values = list(self.value_over_time[strategy].values())
+                dates = self.dates[: self._run_length]
+                values = self.value_over_time_arr[
+                    self._strategy_idx[strategy], : self._run_length
+                ]
                 plt.plot(dates, values, label=strategy.get_name())
 
                 if show_trades:
-                    for trade in self.trades[strategy]:
-                        color = "g" if trade["type"] == "buy" else "r"
-                        plt.scatter(
-                            trade["date"],
-                            self.value_over_time[strategy][trade["date"]],
-                            color=color,
-                            marker="^" if trade["type"] == "buy" else "v",
-                        )
+                    self._scatter_trades(strategy)
 
                 plt.title(f"Portfolio Value Over Time - {strategy.get_name()}")
                 plt.xlabel("Date")
@@ -0,0 +1,140 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from pybacktest._kernel import sma_cross
+from pybacktest.models import Action, Portfolio, Stock
+from pybacktest.strategy import Strategy
+
+
+def precompute_sma_signals(
+    stock: Stock, short_window: int = 5, long_window: int = 20
+) -> None:
+    """
+    attach a crossover signal column computed in one kernel pass
+
+    :param stock: stock to annotate; must hold its full history
+    :type stock: Stock
+    :param short_window: short SMA window in bars
+    :type short_window: int
+    :param long_window: long SMA window in bars
+    :type long_window: int
+    """
+    close = stock.column_values("Close").astype(np.float64)
+    stock.data[f"SMA_SIGNAL_{short_window}_{long_window}"] = sma_cross(
+        close, short_window, long_window
+    )
+
+
+def buy_and_hold(ticker: str) -> Strategy:
+    """
+    buy as many shares as possible on the first bar and never sell
+
+    :param ticker: ticker to hold
+    :type ticker: str
+    :return: strategy instance for Backtest
+    :rtype: Strategy
+    """
+
+    def func(
+        portfolio: Portfolio, stocks: List[Stock], date: pd.Timestamp
+    ) -> List[Action]:
+        if portfolio.stock_count[ticker] > 0:
+            return []
+        for stock in stocks:
+            if stock.ticker == ticker and len(stock.data) > 0:
+                price = float(stock.column_values("Close")[-1])
+                quantity = int(portfolio.cash // price)
+                if quantity > 0:
+                    return [
+                        Action(
+                            ticker=ticker, type="buy", quantity=quantity, price=price
+                        )
+                    ]
+        return []
+
+    def vectorize(stock: Stock):
+        if stock.ticker != ticker:
+            return None
+        return np.ones(len(stock.data), dtype=np.int8)
+
+    return Strategy(f"Buy and Hold {ticker}", func, vectorize=vectorize)
+
+
+def sma_crossover_strategy(
+    ticker: str, short_window: int = 5, long_window: int = 20
+) -> Strategy:
+    """
+    buy when the short SMA is above the long SMA, sell when it drops below
+
+    When the stock carries precomputed SMA_{window} columns (see
+    Stock.precompute_sma) the strategy reads the current bar directly;
+    otherwise it averages the trailing window of Close prices (O(window)
+    per bar) instead of rebuilding a full rolling mean every day.
+
+    :param ticker: ticker to trade
+    :type ticker: str
+    :param short_window: short SMA window in bars
+    :type short_window: int
+    :param long_window: long SMA window in bars
+    :type long_window: int
+    :return: strategy instance for Backtest
+    :rtype: Strategy
+    """
+
+    short_col = f"SMA_{short_window}"
+    long_col = f"SMA_{long_window}"
+    signal_col = f"SMA_SIGNAL_{short_window}_{long_window}"
+
+    def func(
+        portfolio: Portfolio, stocks: List[Stock], date: pd.Timestamp
+    ) -> List[Action]:
+        for stock in stocks:
+            if stock.ticker != ticker:
+                continue
+            if len(stock.data) < long_window:
+                return []
+            if signal_col in stock.data.columns:
+                # precomputed kernel signal: +1 above, -1 below, 0 warmup
+                signal = int(stock.column_values(signal_col)[-1])
+                price = float(stock.column_values("Close")[-1])
+            elif short_col in stock.data.columns and long_col in stock.data.columns:
+                price = float(stock.column_values("Close")[-1])
+                short_sma = float(stock.column_values(short_col)[-1])
+                long_sma = float(stock.column_values(long_col)[-1])
+                if np.isnan(short_sma) or np.isnan(long_sma):
+                    return []
+                signal = (short_sma > long_sma) - (short_sma < long_sma)
+            else:
+                closes = stock.data["Close"].to_numpy(dtype=np.float64)
+                price = float(closes[-1])
+                short_sma = float(closes[-short_window:].mean())
+                long_sma = float(closes[-long_window:].mean())
+                signal = (short_sma > long_sma) - (short_sma < long_sma)
+            holding = portfolio.stock_count[ticker]
+            if signal > 0 and holding == 0:
+                quantity = int(portfolio.cash // price)
+                if quantity > 0:
+                    return [
+                        Action(
+                            ticker=ticker, type="buy", quantity=quantity, price=price
+                        )
+                    ]
+            elif signal < 0 and holding > 0:
+                return [
+                    Action(ticker=ticker, type="sell", quantity=holding, price=price)
+                ]
+        return []
+
+    def vectorize(stock: Stock):
+        if stock.ticker != ticker:
+            return None
+        close = stock.column_values("Close").astype(np.float64)
+        return sma_cross(close, short_window, long_window)
+
+    return Strategy(
+        f"SMA Crossover {ticker} {short_window}/{long_window}",
+        func,
+        vectorize=vectorize,
+    )
@@ -1,29 +1,202 @@
+import datetime
+import json
+import os
+from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import List, Tuple, Union
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import yfinance as yf
-from pydantic import BaseModel
+
+
+def _fetch_cache_path(ticker: str, start: str, end: str) -> str:
+    cache_dir = os.environ.get(
+        "PYBACKTEST_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "pybacktest"),
+    )
+    return os.path.join(cache_dir, f"{ticker}_{start}_{end}.parquet")
 
 
 class Stock:
+    __slots__ = (
+        "ticker",
+        "start",
+        "end",
+        "fetched",
+        "data",
+        "dates",
+        "_parent",
+        "_view_left",
+        "_view_right",
+        "_index_values_cache",
+        "_index_values_source",
+        "_column_cache",
+        "_column_source",
+        "_rolling_cache",
+        "_mean_cache",
+    )
+
     def __init__(self, ticker: str, start: str, end: str, fetch: bool = True):
         self.ticker = ticker
         self.start = start
         self.end = end
+        self.fetched = fetch
         self.data = self.fetch_data() if fetch else pd.DataFrame()
-        self.dates = self.data.index.to_list() if fetch else []
+        # the index itself, not a to_list() materialization of Timestamps
+        self.dates = self.data.index
+        # set by cut_data on views: array reads delegate to the root
+        # Stock so one cached computation serves every per-bar slice
+        self._parent = None
+        self._view_left = 0
+        self._view_right = 0
+        self._index_values_cache = None
+        self._index_values_source = None
+        self._column_cache = {}
+        self._column_source = None
+        self._rolling_cache = {}
+        self._mean_cache = {}
+
+    def _check_cache_source(self) -> None:
+        if self._column_source is not self.data:
+            self._column_source = self.data
+            self._column_cache = {}
+            self._rolling_cache = {}
+            self._mean_cache = {}
+
+    def rolling_mean(self, column: str, window: int) -> np.ndarray:
+        """
+        cached rolling mean (min_periods=1) of a column
+
+        :param column: column name, e.g. 'Close'
+        :type column: str
+        :param window: rolling window length in bars
+        :type window: int
+        :return: rolling mean aligned with the index
+        :rtype: np.ndarray
+        """
+        # prefix views read the root's cached full-history rolling mean;
+        # rolling only looks backward, so the prefix is identical
+        if self._parent is not None and self._view_left == 0:
+            return self._parent.rolling_mean(column, window)[: self._view_right]
+        self._check_cache_source()
+        key = (column, window)
+        arr = self._rolling_cache.get(key)
+        if arr is None:
+            arr = (
+                self.data[column]
+                .rolling(window=window, min_periods=1)
+                .mean()
+                .to_numpy()
+            )
+            self._rolling_cache[key] = arr
+        return arr
+
+    def mean_value(self, column: str) -> float:
+        """
+        cached full-history mean of a column (NaN-skipping)
+
+        :param column: column name, e.g. 'Close'
+        :type column: str
+        :return: mean of the column
+        :rtype: float
+        """
+        self._check_cache_source()
+        value = self._mean_cache.get(column)
+        if value is None:
+            value = float(self.data[column].mean())
+            self._mean_cache[column] = value
+        return value
+
+    def column_values(self, column: str) -> np.ndarray:
+        """
+        cached NumPy view of a column, invalidated when data is swapped
+
+        :param column: column name, e.g. 'Close'
+        :type column: str
+        :return: the column as a NumPy array aligned with the index
+        :rtype: np.ndarray
+        """
+        # views are slices of the root frame, so the root's cached array
+        # serves them zero-copy regardless of the slice bounds
+        if self._parent is not None:
+            return self._parent.column_values(column)[
+                self._view_left : self._view_right
+            ]
+        self._check_cache_source()
+        arr = self._column_cache.get(column)
+        if arr is None:
+            arr = self.data[column].to_numpy()
+            self._column_cache[column] = arr
+        return arr
+
+    def _index_values(self) -> np.ndarray:
+        """Cached datetime64 view of the index for fast searchsorted slicing."""
+        index = self.data.index
+        if self._index_values_source is not index:
+            self._index_values_source = index
+            self._index_values_cache = index.values
+        return self._index_values_cache
+
+    @classmethod
+    def bulk_fetch(cls, tickers: List[str], start: str, end: str) -> List["Stock"]:
+        """
+        fetch many tickers with a single yfinance request
+
+        One network round-trip instead of one per Stock; the multi-index
+        result is split per ticker and run through the usual
+        data_processing.
+
+        :param tickers: tickers to download
+        :type tickers: List[str]
+        :param start: start date 'YYYY-MM-DD'
+        :type start: str
+        :param end: end date 'YYYY-MM-DD'
+        :type end: str
+        :return: one fetched Stock per ticker, in input order
+        :rtype: List[Stock]
+        """
+        data = yf.download(
+            list(tickers), start=start, end=end, progress=False, group_by="ticker"
+        )
+        stocks = []
+        for ticker in tickers:
+            frame = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+            # data_processing renames positionally, so fix the column order
+            frame = frame.loc[:, ["Close", "High", "Low", "Open", "Volume"]].copy()
+            stock = cls(ticker, start, end, fetch=False)
+            stock.data = stock.data_processing(frame)
+            stock.dates = stock.data.index
+            stock.fetched = True
+            stocks.append(stock)
+        return stocks
 
     def fetch_data(self) -> pd.DataFrame:
+        # closed date ranges (end before today) never change, so their
+        # processed frames are reused from a Parquet cache across runs
+        cache_path = _fetch_cache_path(self.ticker, self.start, self.end)
+        cacheable = self.end < datetime.date.today().isoformat()
+        if cacheable and os.path.exists(cache_path):
+            try:
+                return pd.read_parquet(cache_path)
+            except (ImportError, OSError, ValueError):
+                pass  # no parquet engine or stale entry; refetch below
         data = yf.download(self.ticker, start=self.start, end=self.end, progress=False)
         data = self.data_processing(data=data)
+        if cacheable:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                data.to_parquet(cache_path)
+            except (ImportError, OSError):
+                pass  # caching is best-effort; keep going uncached
         return data
 
     def data_processing(self, data: pd.DataFrame) -> pd.DataFrame:
         data.columns = ["Close", "High", "Low", "Open", "Volume"]  # Rename
-        data["Change"] = data["Close"] - data["Close"].shift(1)  # Daily Change
+        prev_close = data["Close"].shift(1)  # shifted once, used twice
+        data["Change"] = data["Close"] - prev_close  # Daily Change
         data["Change_Pct"] = (
-            data["Change"] / data["Close"].shift(1) * 100
+            data["Change"] / prev_close * 100
         )  # Daily Change Percentage
         return data
 
@@ -34,7 +207,12 @@ class Stock:
             start = pd.to_datetime(start)
         if isinstance(end, str):
             end = pd.to_datetime(end)
-        data = self.data.loc[start:end]
+        # searchsorted on the cached index values instead of a .loc label
+        # slice: no per-call index engine work, iloc returns a cheap view
+        index_values = self._index_values()
+        left = int(np.searchsorted(index_values, start.to_datetime64(), side="left"))
+        right = int(np.searchsorted(index_values, end.to_datetime64(), side="right"))
+        data = self.data.iloc[left:right]
         stock = Stock(
             self.ticker,
             start.strftime("%Y-%m-%d"),
@@ -42,10 +220,52 @@ class Stock:
             fetch=False,
         )
         stock.data = data
-        stock.dates = data.index.to_list()
+        stock.dates = data.index
+        # link the view to the root Stock (composing offsets for views
+        # of views) so rolling_mean/column_values hit the root's caches
+        # instead of rematerializing arrays on each short-lived slice
+        stock._parent = self._parent if self._parent is not None else self
+        stock._view_left = self._view_left + left
+        stock._view_right = self._view_left + right
         return stock
 
+    def precompute_sma(self, windows: Tuple[int, ...] = (5, 20)) -> None:
+        """
+        add SMA_{window} columns computed once over the full history
+
+        Strategies can then read the value at the current bar instead of
+        recomputing a rolling mean every day; the columns survive cut_data
+        slicing, so per-bar views carry them along.
+
+        :param windows: rolling window lengths in bars
+        :type windows: Tuple[int, ...]
+        """
+        for window in windows:
+            self.data[f"SMA_{window}"] = (
+                self.data["Close"].rolling(window=window).mean()
+            )
+
+    def price_asof(self, date: Union[str, pd.Timestamp]) -> float:
+        """
+        last Close at or before a date, without touching the DataFrame
+
+        :param date: date to look up
+        :type date: Union[str, pd.Timestamp]
+        :return: Close price as of the date, NaN if before the first bar
+        :rtype: float
+        """
+        if isinstance(date, str):
+            date = pd.to_datetime(date)
+        index_values = self._index_values()
+        i = int(np.searchsorted(index_values, date.to_datetime64(), side="right")) - 1
+        if i < 0:
+            return float("nan")
+        return float(self.data["Close"].iloc[i])
+
     def plot_data(self, figsize: Tuple[int, int] = (14, 7)):
+        # imported here so headless runs never pay the matplotlib import
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=figsize)
         plt.plot(self.data.index, self.data["Close"], label="Close Price")
         plt.title(f"{self.ticker} Stock Price")
@@ -56,20 +276,128 @@ class Stock:
         plt.show()
 
 
-class Action(BaseModel):
+class ActionKind(IntEnum):
+    """int codes for action sides; arrays of these feed the kernel."""
+
+    SELL = 0
+    BUY = 1
+
+
+@dataclass(slots=True)
+class Action:
+    """
+    one executed or proposed trade; a slotted dataclass rather than a
+    pydantic model because thousands are built per backtest and the
+    fields need no validation past the coercions below
+    """
+
     ticker: str
     type: str  # 'buy' or 'sell'
     quantity: int
     price: float
+    # side code resolved once here; hot loops compare this int instead
+    # of re-doing the string compare per action
+    kind: ActionKind = field(init=False)
+
+    def __post_init__(self):
+        # mirror the coercions callers got from the old pydantic model
+        self.quantity = int(self.quantity)
+        self.price = float(self.price)
+        self.kind = ActionKind.SELL if self.type == "sell" else ActionKind.BUY
+
+    def model_dump_json(self) -> str:
+        # kind is derived, so the dump keeps the old pydantic field set
+        return json.dumps(
+            {
+                "ticker": self.ticker,
+                "type": self.type,
+                "quantity": self.quantity,
+                "price": self.price,
+            }
+        )
+
+
+class _TickerArrayView:
+    """
+    dict-like view over a per-ticker NumPy array
+
+    Keeps the holdings in one contiguous int64 array (fast dot products
+    with a price row) while existing callers keep using ticker keys.
+    """
+
+    __slots__ = ("_idx", "array")
+
+    def __init__(self, idx: dict, array: np.ndarray):
+        self._idx = idx
+        self.array = array
+
+    def __getitem__(self, ticker):
+        return self.array[self._idx[ticker]]
+
+    def __setitem__(self, ticker, value):
+        self.array[self._idx[ticker]] = value
+
+    def __contains__(self, ticker):
+        return ticker in self._idx
+
+    def __iter__(self):
+        return iter(self._idx)
+
+    def __len__(self):
+        return len(self._idx)
+
+    def keys(self):
+        return self._idx.keys()
+
+    def values(self):
+        return self.array.tolist()
+
+    def items(self):
+        return zip(self._idx.keys(), self.array.tolist())
+
+    def __or__(self, other):
+        return dict(self.items()) | dict(other)
+
+    def __ror__(self, other):
+        return dict(other) | dict(self.items())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
 
 
 class Portfolio:
+    __slots__ = (
+        "initial_capital",
+        "cash",
+        "tickers",
+        "_idx",
+        "counts",
+        "stock_count",
+        "buy_values",
+        "buy_value",
+    )
+
     def __init__(self, cash: float, tickers: List[str]):
         self.initial_capital = cash
         self.cash = cash
         self.tickers = tickers
-        self.stock_count = {ticker: 0 for ticker in tickers}
-        self.buy_value = {ticker: 0 for ticker in tickers}
+        self._idx = {ticker: i for i, ticker in enumerate(tickers)}
+        self.counts = np.zeros(len(tickers), dtype=np.int64)
+        self.stock_count = _TickerArrayView(self._idx, self.counts)
+        self.buy_values = np.zeros(len(tickers), dtype=np.float64)
+        self.buy_value = _TickerArrayView(self._idx, self.buy_values)
+
+    def reset(self, initial_capital: float) -> None:
+        """
+        reset to an all-cash state in place, reusing the counts array
+
+        :param initial_capital: starting cash after the reset
+        :type initial_capital: float
+        """
+        self.initial_capital = initial_capital
+        self.cash = initial_capital
+        self.counts.fill(0)
+        self.buy_values.fill(0.0)
 
     def update(self, ticker: str, amount: int, price: float) -> None:
         """
@@ -83,16 +411,17 @@ class Portfolio:
         :param price: buy price of stock
         :type price: float
         """
+        i = self._idx[ticker]
         if amount > 0:
-            current_value = self.stock_count[ticker] * self.buy_value[ticker]
+            current_value = self.counts[i] * self.buy_values[i]
             cost = amount * price
             updated_value = current_value + cost
             self.cash -= cost
-            self.stock_count[ticker] += amount
-            self.buy_value[ticker] = updated_value / self.stock_count[ticker]
+            self.counts[i] += amount
+            self.buy_values[i] = updated_value / self.counts[i]
         if amount < 0:
             rev = -amount * price
             self.cash += rev
-            self.stock_count[ticker] += amount
-            if self.stock_count[ticker] <= 0:
-                self.buy_value[ticker] = 0
+            self.counts[i] += amount
+            if self.counts[i] <= 0:
+                self.buy_values[i] = 0.0
@@ -1,11 +1,40 @@
+import logging
 import math
+from itertools import chain
 from typing import Callable, Dict, List, Literal, Optional, Union
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, RootModel
 
 from pybacktest.models import Action, Portfolio, Stock
 
+logger = logging.getLogger(__name__)
+
+try:  # blocked, multi-threaded arithmetic for wide rebalances
+    import numexpr as _ne
+except ImportError:  # pragma: no cover - numexpr is optional
+    _ne = None
+
+# jump tables keyed by the config strings, looked up once per bar
+# instead of walking an if/elif chain of string comparisons
+_THRESHOLD_RULES = {
+    "percent-change": lambda threshold, value: value,
+    "point": lambda threshold, value: threshold + value,
+    "profit-rate": lambda threshold, value: threshold * (100 + value) / 100,
+}
+
+# shared empty result for managers configured with no strategies
+_EMPTY: tuple = ()
+
+_QUANTITY_RULES = {
+    "count": lambda quantity, price, portfolio, ticker: quantity,
+    "percent": lambda quantity, price, portfolio, ticker: max(
+        math.floor(portfolio.stock_count[ticker] * (quantity / 100)), 1
+    ),
+    "value": lambda quantity, price, portfolio, ticker: quantity // price,
+}
+
 
 class TradeAction(BaseModel):
     ticker: str  # index ticker
@@ -41,67 +70,87 @@ class StrategyManager:
     def __init__(self, name: str, strategies: StrategyWrapper):
         self.name = name
         self.strategies: StrategyWrapper = strategies
+        self._empty = not strategies.root
 
     def apply(
         self, portfolio: Portfolio, stocks: List[Stock], date: pd.Timestamp
     ) -> List[Action]:
-        actions = []
-        for ticker, strategy in self.strategies.items():
-            actions.extend(
-                self.apply_strategy(ticker, strategy, portfolio, stocks, date)
+        # no strategies configured: skip the per-bar work entirely
+        if self._empty:
+            return _EMPTY
+        # one ticker->Stock map per bar instead of a scan per strategy
+        stock_by_ticker = {stock.ticker: stock for stock in stocks}
+        actions = list(
+            chain.from_iterable(
+                self.apply_strategy(ticker, strategy, portfolio, stock_by_ticker, date)
+                for ticker, strategy in self.strategies.items()
             )
+        )
         if date.day == 15:
             actions.extend(self.rebalance(portfolio, stocks, date))
-        # print(f"actions: {actions}")
+        # guard keeps the per-bar Action-list repr off the hot path
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("actions: %s", actions)
         return actions
 
     def rebalance(
         self, portfolio: Portfolio, stocks: List[Stock], date: pd.Timestamp
     ) -> List[Action]:
-        total_value = portfolio.cash
-        current_prices = {}
-        for stock in stocks:
-            if stock.ticker in portfolio.stock_count:
-                price = stock.data["Close"].iloc[-1]
-                current_prices[stock.ticker] = price
-                total_value += portfolio.stock_count[stock.ticker] * price
+        if self._empty:
+            return _EMPTY
+        held = [stock for stock in stocks if stock.ticker in portfolio.stock_count]
+        prices = np.array(
+            [stock.column_values("Close")[-1] for stock in held], dtype=np.float64
+        )
+        counts = np.array(
+            [portfolio.stock_count[stock.ticker] for stock in held], dtype=np.float64
+        )
+        total_value = portfolio.cash + float(counts @ prices)
+        price_by_ticker = dict(zip((stock.ticker for stock in held), prices.tolist()))
 
-        actions = []
-        for ticker, strategy in self.strategies.items():
-            weight = strategy.portfolio_weight
-            if weight > 0:
-                current_price = current_prices.get(ticker, 0)
-                if current_price == 0:
-                    continue
-
-                target_value = total_value * weight
-                current_value = portfolio.stock_count[ticker] * current_price
-                diff = target_value - current_value
-
-                # if diff > 0:  # Buy
-                #     qty = int(diff // current_price)
-                #     if qty > 0:
-                #         actions.append(
-                #             Action(
-                #                 ticker=ticker,
-                #                 type="buy",
-                #                 quantity=qty,
-                #                 price=current_price,
-                #             )
-                #         )
-                if diff < 0:  # Sell
-                    qty = int(abs(diff) // current_price)
-                    if qty > 0:
-                        actions.append(
-                            Action(
-                                ticker=ticker,
-                                type="sell",
-                                quantity=qty,
-                                price=current_price,
-                            )
-                        )
+        # aligned arrays over the configured strategies: diffs and
+        # quantities come out of one vectorized pass instead of a
+        # per-ticker Python loop
+        items = list(self.strategies.items())
+        weights = np.array(
+            [config.portfolio_weight for _, config in items], dtype=np.float64
+        )
+        current_prices = np.array(
+            [price_by_ticker.get(ticker, 0.0) for ticker, _ in items],
+            dtype=np.float64,
+        )
+        current_counts = np.array(
+            [
+                portfolio.stock_count[ticker] if ticker in portfolio.stock_count else 0
+                for ticker, _ in items
+            ],
+            dtype=np.float64,
+        )
+        if _ne is not None and len(items) >= 64:
+            # numexpr only pays off once the arrays span cache lines;
+            # small configs stay on the plain NumPy expression
+            diff = _ne.evaluate(
+                "total_value * weights - current_counts * current_prices"
+            )
+        else:
+            diff = total_value * weights - current_counts * current_prices
+        # buys during rebalancing stay disabled; only overweight
+        # positions are trimmed
+        sell_mask = (weights > 0) & (current_prices != 0) & (diff < 0)
+        quantities = np.zeros(len(items), dtype=np.int64)
+        quantities[sell_mask] = (
+            np.abs(diff[sell_mask]) // current_prices[sell_mask]
+        ).astype(np.int64)
 
-        actions.sort(key=lambda x: 0 if x.type == "sell" else 1)
+        actions = [
+            Action(
+                ticker=items[i][0],
+                type="sell",
+                quantity=int(quantities[i]),
+                price=float(current_prices[i]),
+            )
+            for i in np.nonzero(quantities > 0)[0]
+        ]
         return actions
 
     def get_name(self) -> str:
@@ -112,173 +161,88 @@ class StrategyManager:
         ticker: str,
         strategy: StrategyConfig,
         portfolio: Portfolio,
-        stocks: List[Stock],
+        stocks: Dict[str, Stock],
         date: pd.Timestamp,
     ) -> List[Action]:
-        target_data, buy_index_data, sell_index_data = None, None, None
-        actions = []
-        for s in stocks:
-            if s.ticker == ticker:
-                target_data = s
-            if s.ticker == strategy.buy.ticker:
-                buy_index_data = s
-            if s.ticker == strategy.sell.ticker:
-                sell_index_data = s
+        target_data = stocks.get(ticker)
+        buy_index_data = stocks.get(strategy.buy.ticker)
+        sell_index_data = stocks.get(strategy.sell.ticker)
         if not target_data or not buy_index_data or not sell_index_data:
             raise KeyError("No Stock Data for Strategy")
-        # buy part ---------------------------------------------------------
-        buy: TradeAction = strategy.buy
-        price = target_data.data[buy.price_point].iloc[-1]
-        indicator = buy.indicator
+        price = target_data.column_values(strategy.buy.price_point)[-1]
+        actions = []
+        for side, side_cfg, index_data in (
+            ("buy", strategy.buy, buy_index_data),
+            ("sell", strategy.sell, sell_index_data),
+        ):
+            action = StrategyManager._evaluate_side(
+                side, side_cfg, index_data, price, ticker, portfolio, strategy
+            )
+            if action is not None:
+                actions.append(action)
+        return actions
+
+    @staticmethod
+    def _evaluate_side(
+        side: Literal["buy", "sell"],
+        side_cfg: TradeAction,
+        index_data: Stock,
+        price: float,
+        ticker: str,
+        portfolio: Portfolio,
+        strategy: StrategyConfig,
+    ) -> Optional[Action]:
+        """One side of a strategy; buy and sell share the same formula."""
+        # flat positions cannot sell and empty wallets cannot buy: the
+        # clamped action would be zero-quantity (and dropped by
+        # execute_action), so skip the indicator work entirely
+        if side == "sell":
+            if portfolio.stock_count[ticker] <= 0:
+                return None
+        elif portfolio.cash < price:
+            return None
+        # hoist pydantic field reads out of the branchy body below
+        qty_type, qty_value = side_cfg.quantity
+        indicator = side_cfg.indicator
         if indicator[0] == "average":
-            if isinstance(buy.window, int):
-                compare_value = (
-                    buy_index_data.data[indicator[1]]
-                    .rolling(window=buy.window, min_periods=1)
-                    .mean()
+            window = side_cfg.window
+            if isinstance(window, int) and not isinstance(window, bool):
+                compare_value = float(
+                    index_data.rolling_mean(indicator[1], window)[-1]
                 )
             else:
-                compare_value = buy_index_data.data[indicator[1]].mean()
-            compare_value = float(compare_value.to_numpy()[-1])
+                compare_value = index_data.mean_value(indicator[1])
         elif indicator[0] == "current":
-            compare_value = buy_index_data.data[indicator[1]].iloc[-1]
+            compare_value = index_data.column_values(indicator[1])[-1]
         else:
             raise ValueError("Error While setting compare value")
         threshold = portfolio.buy_value[ticker]
         # if threshold <= 0: threshold = price
-        crit = buy.threshold
-        if crit[0] == "percent-change":
-            threshold = crit[1]
-        elif crit[0] == "point":
-            threshold += crit[1]
-        elif crit[0] == "profit-rate":
-            threshold *= (100 + crit[1]) / 100
-        else:
+        crit = side_cfg.threshold
+        rule = _THRESHOLD_RULES.get(crit[0])
+        if rule is None:
             raise ValueError(f"you got wrong threshold {crit[0]}")
-        if crit[0] != "percent-change" and threshold == 0:
-            if buy.quantity[0] == "split":
-                if strategy.portfolio_weight == 0:
-                    strategy.portfolio_weight = 1.0
-                val = (
-                    portfolio.initial_capital / buy.quantity[1]
-                ) * strategy.portfolio_weight
-                actions.append(
-                    StrategyManager.create_action(
-                        "buy", ticker, price, "value", val, portfolio
-                    )
-                )
-            else:
-                actions.append(
-                    StrategyManager.create_action(
-                        "buy",
-                        ticker,
-                        price,
-                        buy.quantity[0],
-                        buy.quantity[1],
-                        portfolio,
-                    )
-                )
+        threshold = rule(threshold, crit[1])
+        if side == "buy" and crit[0] != "percent-change" and threshold == 0:
+            triggered = True  # no position yet: take the initial buy
         elif crit[1] <= 0:
-            if compare_value <= threshold:
-                if buy.quantity[0] == "split":
-                    if strategy.portfolio_weight == 0:
-                        strategy.portfolio_weight = 1.0
-                    val = (
-                        portfolio.initial_capital / buy.quantity[1]
-                    ) * strategy.portfolio_weight
-                    actions.append(
-                        StrategyManager.create_action(
-                            "buy", ticker, price, "value", val, portfolio
-                        )
-                    )
-                else:
-                    actions.append(
-                        StrategyManager.create_action(
-                            "buy",
-                            ticker,
-                            price,
-                            buy.quantity[0],
-                            buy.quantity[1],
-                            portfolio,
-                        )
-                    )
+            triggered = compare_value <= threshold
         else:
-            if compare_value >= threshold:
-                if buy.quantity[0] == "split":
-                    if strategy.portfolio_weight == 0:
-                        strategy.portfolio_weight = 1.0
-                    val = (
-                        portfolio.initial_capital / buy.quantity[1]
-                    ) * strategy.portfolio_weight
-                    actions.append(
-                        StrategyManager.create_action(
-                            "buy", ticker, price, "value", val, portfolio
-                        )
-                    )
-                else:
-                    actions.append(
-                        StrategyManager.create_action(
-                            "buy",
-                            ticker,
-                            price,
-                            buy.quantity[0],
-                            buy.quantity[1],
-                            portfolio,
-                        )
-                    )
-        # sell part ---------------------------------------------------------
-        sell: TradeAction = strategy.sell
-        indicator = sell.indicator
-        if indicator[0] == "average":
-            if isinstance(sell.window, int):
-                compare_value = (
-                    sell_index_data.data[indicator[1]]
-                    .rolling(window=sell.window, min_periods=1)
-                    .mean()
-                )
-            else:
-                compare_value = sell_index_data.data[indicator[1]].mean()
-            compare_value = float(compare_value.to_numpy()[-1])
-        elif indicator[0] == "current":
-            compare_value = sell_index_data.data[indicator[1]].iloc[-1]
-        else:
-            raise ValueError("Error While setting compare value")
-        threshold = portfolio.buy_value[ticker]
-        # if threshold <= 0: threshold = price
-        crit = sell.threshold
-        if crit[0] == "percent-change":
-            threshold = crit[1]
-        elif crit[0] == "point":
-            threshold += crit[1]
-        elif crit[0] == "profit-rate":
-            threshold *= (100 + crit[1]) / 100
-        else:
-            raise ValueError(f"you got wrong threshold {crit[0]}")
-        if crit[1] <= 0:
-            if compare_value <= threshold:
-                actions.append(
-                    StrategyManager.create_action(
-                        "sell",
-                        ticker,
-                        price,
-                        sell.quantity[0],
-                        sell.quantity[1],
-                        portfolio,
-                    )
-                )
-        else:
-            if compare_value >= threshold:
-                actions.append(
-                    StrategyManager.create_action(
-                        "sell",
-                        ticker,
-                        price,
-                        sell.quantity[0],
-                        sell.quantity[1],
-                        portfolio,
-                    )
-                )
-        return actions
+            triggered = compare_value >= threshold
+        if not triggered:
+            return None
+        if side == "buy" and qty_type == "split":
+            if strategy.portfolio_weight == 0:
+                strategy.portfolio_weight = 1.0
+            val = (
+                portfolio.initial_capital / qty_value
+            ) * strategy.portfolio_weight
+            return StrategyManager.create_action(
+                "buy", ticker, price, "value", val, portfolio
+            )
+        return StrategyManager.create_action(
+            side, ticker, price, qty_type, qty_value, portfolio
+        )
 
     @staticmethod
     def create_action(
@@ -289,22 +253,19 @@ class StrategyManager:
         quantity,
         portfolio: Portfolio,
     ):
-        if quantity_type == "count":
-            pass
-        elif quantity_type == "percent":
-            quantity = max(
-                math.floor(portfolio.stock_count[ticker] * (quantity / 100)), 1
-            )
-        elif quantity_type == "value":
-            quantity = quantity // price
-        else:
+        rule = _QUANTITY_RULES.get(quantity_type)
+        if rule is None:
             raise ValueError("wrong value for quantity_type!")
+        quantity = rule(quantity, price, portfolio, ticker)
         if type == "buy":
-            over_quantity = math.ceil((price * quantity - portfolio.cash) / price)
+            # clamp to what the cash can pay for; one integer division
+            # instead of the old over_quantity ceil round-trip, which
+            # could overshoot by a share on exact multiples
+            max_affordable = int(portfolio.cash // price)
             return Action(
                 ticker=ticker,
                 type=type,
-                quantity=min(quantity, quantity - over_quantity),
+                quantity=min(quantity, max_affordable),
                 price=price,
             )
         elif type == "sell":
@@ -320,9 +281,12 @@ class StrategyManager:
 
 # for only testing
 class Strategy:
-    def __init__(self, name: str, func: Callable):
+    def __init__(self, name: str, func: Callable, vectorize: Optional[Callable] = None):
         self.name = name
         self.func: Callable = func
+        # optional stock -> per-bar signal array (+1 buy, -1 sell, 0 hold);
+        # when present, Backtest.run skips the per-bar apply path entirely
+        self.vectorize: Optional[Callable] = vectorize
 
     def apply(
         self, portfolio: Portfolio, stocks: List[Stock], date: pd.Timestamp
@@ -1,3 +1,4 @@
+import hashlib
 import json
 
 import pandas as pd
@@ -7,6 +8,141 @@ from pybacktest.backtest import Backtest
 from pybacktest.models import Stock
 from pybacktest.strategy import StrategyManager, StrategyWrapper
 
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:  # orjson is optional; stdlib json is the fallback
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=4, ensure_ascii=False)
+
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; uploads fall back to one-shot parse
+    ijson = None
+
+
+def _load_uploaded_config(uploaded_file) -> dict:
+    """
+    Parse an uploaded strategy config into a dict.
+
+    With ijson installed the ticker entries are streamed off the file
+    one at a time, so malformed input fails early and large uploads
+    never hold both the raw text and the parsed tree in memory.
+    """
+    if ijson is not None:
+        head = uploaded_file.read(16).lstrip()
+        uploaded_file.seek(0)
+        if not head.startswith(b"{"):
+            raise ValueError("root must be an object")
+        try:
+            return dict(ijson.kvitems(uploaded_file, ""))
+        except ijson.JSONError as exc:
+            raise ValueError(str(exc)) from exc
+    return _json_loads(uploaded_file.read())
+
+
+# selectbox options and their O(1) default-index lookups, built once at
+# import instead of two linear scans per selectbox per rerun
+OPTS_AGG = ("current", "average")
+OPTS_FIELD = ("Close", "Change_Pct", "Change", "Open", "High", "Low")
+OPTS_TRADE_AS = ("Close", "Open", "High", "Low")
+OPTS_CRIT = ("percent-change", "profit-rate", "point", "value")
+OPTS_QTY = ("count", "percent", "value", "split")
+IDX_AGG = {v: i for i, v in enumerate(OPTS_AGG)}
+IDX_FIELD = {v: i for i, v in enumerate(OPTS_FIELD)}
+IDX_TRADE_AS = {v: i for i, v in enumerate(OPTS_TRADE_AS)}
+IDX_CRIT = {v: i for i, v in enumerate(OPTS_CRIT)}
+IDX_QTY = {v: i for i, v in enumerate(OPTS_QTY)}
+
+
+@st.cache_data(show_spinner=False)
+def _strategies_json(strategies: dict) -> str:
+    # reruns happen on every keystroke; only reserialize when the
+    # strategies dict actually changed
+    return _json_dumps(strategies)
+
+
+@st.cache_data(show_spinner=False)
+def _strategies_json_bytes(strategies: dict) -> bytes:
+    # bytes payload for the download button; passing bytes skips the
+    # per-rerun str->bytes conversion inside Streamlit
+    return _strategies_json(strategies).encode("utf-8")
+
+
+@st.cache_resource(show_spinner=False)
+def _validated_wrapper(strategies_json: str) -> StrategyWrapper:
+    # pydantic validation runs once per distinct config, not per submit
+    return StrategyWrapper.model_validate_json(strategies_json)
+
+
+@st.cache_resource(show_spinner="Running backtest...")
+def _run_backtest(
+    strategies_json: str, start: str, end: str, initial_cash: float
+) -> Backtest:
+    # keyed on the inputs: resubmitting the form with the same
+    # strategies and dates reuses the finished run instead of
+    # refetching data and simulating again
+    strategies = _json_loads(strategies_json)
+    # one threaded download for every ticker instead of a serial
+    # HTTP round-trip per Stock
+    stocks = Stock.bulk_fetch(list(strategies), start, end)
+    strategy = StrategyManager("strategy", _validated_wrapper(strategies_json))
+    backtest = Backtest(stocks, [strategy], initial_cash)
+    backtest.run()
+    return backtest
+
+
+@st.fragment
+def _portfolio_value_slider(backtest: Backtest, start, end):
+    # a fragment so dragging the slider reruns only this block, not
+    # the whole page
+    st.subheader("Portfolio Value at a Specific Point in Time")
+    date = st.slider(
+        "date",
+        start,
+        end,
+        end,
+        label_visibility="hidden",
+        key="en_slider",
+    )
+    # equity curve is precomputed by run(); the slider is an O(1)
+    # lookup instead of a revaluation per change
+    point_value = backtest.equity_curve().asof(pd.Timestamp(date))
+    if pd.isna(point_value):
+        point_value = backtest.portfolio.initial_capital
+    st.markdown(f"Value at {date}: **${point_value:,.2f}**")
+
+
+@st.cache_data(show_spinner=False, hash_funcs={Backtest: id})
+def _trade_frames(backtest: Backtest) -> list:
+    # built once per backtest instead of reconstructing a frame from
+    # the list of trade dicts on every rerun
+    frames = []
+    for strategy in backtest.trades:
+        frame = pd.DataFrame(backtest.trades[strategy])
+        if not frame.empty:
+            frame["value"] = frame["quantity"].to_numpy() * frame["price"].to_numpy()
+        frames.append(frame)
+    return frames
+
+
+@st.cache_resource(show_spinner=False)
+def _performance_figure(_backtest: Backtest, run_key: int):
+    # keyed by the backtest identity so unrelated widget changes reuse
+    # the figure instead of re-running matplotlib
+    return _backtest.plot_performance(instance_show=False)
+
 
 def show_english_page():
     # Page basic settings
@@ -27,24 +163,36 @@ def show_english_page():
             if st.button(
                 "Apply Data", type="primary", use_container_width=True, key="en_apply"
             ):
-                try:
-                    loaded_data = json.load(uploaded_file)
-                    if isinstance(loaded_data, dict):
-                        st.session_state["strategies"] = loaded_data
-                        st.success("JSON file loaded successfully!")
-                        st.rerun()
-                    else:
-                        st.error("Invalid JSON format. (Root must be a dictionary)")
-                except json.JSONDecodeError:
-                    st.error("Invalid JSON file.")
-                except Exception as e:
-                    st.error(f"An error occurred: {e}")
+                upload_hash = hashlib.blake2b(
+                    uploaded_file.getvalue(), digest_size=16
+                ).hexdigest()
+                if upload_hash == st.session_state.get("_upload_hash"):
+                    # same bytes as the applied config; skip the re-parse
+                    st.info("This file is already applied.")
+                else:
+                    try:
+                        loaded_data = _load_uploaded_config(uploaded_file)
+                        if isinstance(loaded_data, dict):
+                            st.session_state["strategies"] = loaded_data
+                            st.session_state["_upload_hash"] = upload_hash
+                            st.success("JSON file loaded successfully!")
+                            st.rerun()
+                        else:
+                            st.error(
+                                "Invalid JSON format. (Root must be a dictionary)"
+                            )
+                    except ValueError:  # covers json and orjson decode errors
+                        st.error("Invalid JSON file.")
+                    except Exception as e:
+                        st.error(f"An error occurred: {e}")
 
         st.markdown("---")
 
         # 2. Reset Button
         if st.button("🗑️ Reset All", use_container_width=True, key="en_reset"):
             st.session_state["strategies"] = {}
+            # strategies no longer match the applied file; allow re-apply
+            st.session_state.pop("_upload_hash", None)
             st.rerun()
 
     # -----------------------------------------------------------------------------
@@ -105,34 +253,23 @@ def show_english_page():
 
             st.caption("Base (By)")
             c1, c2 = st.columns(2)
-            # Find index for selectbox default value
-            opts_agg = ["current", "average"]
-            opts_field = ["Close", "Change_Pct", "Change", "Open", "High", "Low"]
-            opts_trade_as = ["Close", "Open", "High", "Low"]
-
-            idx_agg = opts_agg.index(def_by_agg) if def_by_agg in opts_agg else 0
-            idx_field = (
-                opts_field.index(def_by_field) if def_by_field in opts_field else 0
-            )
-            idx_trade_as = (
-                opts_trade_as.index(def_trade_as)
-                if def_trade_as in opts_trade_as
-                else 0
-            )
 
             by_agg = c1.selectbox(
                 "Aggregation Method",
-                opts_agg,
-                index=idx_agg,
+                OPTS_AGG,
+                index=IDX_AGG.get(def_by_agg, 0),
                 key=f"{key_prefix}_by_agg",
             )
             by_field = c2.selectbox(
-                "Field", opts_field, index=idx_field, key=f"{key_prefix}_by_field"
+                "Field",
+                OPTS_FIELD,
+                index=IDX_FIELD.get(def_by_field, 0),
+                key=f"{key_prefix}_by_field",
             )
             price_point = st.selectbox(
                 "Purchase Price Basis",
-                opts_trade_as,
-                index=idx_trade_as,
+                OPTS_TRADE_AS,
+                index=IDX_TRADE_AS.get(def_trade_as, 0),
                 key=f"{key_prefix}_trade_as",
             )
 
@@ -159,15 +296,11 @@ def show_english_page():
         with col3:
             st.caption("Criteria")
             c3, c4 = st.columns(2)
-            opts_crit = ["percent-change", "profit-rate", "point", "value"]
-            idx_crit = (
-                opts_crit.index(def_crit_type) if def_crit_type in opts_crit else 0
-            )
 
             crit_type = c3.selectbox(
                 "Criteria Type",
-                opts_crit,
-                index=idx_crit,
+                OPTS_CRIT,
+                index=IDX_CRIT.get(def_crit_type, 0),
                 key=f"{key_prefix}_crit_type",
             )
             crit_val = c4.number_input(
@@ -181,11 +314,12 @@ def show_english_page():
         with col4:
             st.caption("Order Quantity")
             c5, c6 = st.columns(2)
-            if allowed_qty_types:
-                opts_qty = allowed_qty_types
-            else:
-                opts_qty = ["count", "percent", "value", "split"]
-            idx_qty = opts_qty.index(def_qty_type) if def_qty_type in opts_qty else 0
+            opts_qty = allowed_qty_types if allowed_qty_types else OPTS_QTY
+            # allowed_qty_types is always a prefix of OPTS_QTY, so the
+            # shared index map works with a bounds guard
+            idx_qty = IDX_QTY.get(def_qty_type, 0)
+            if idx_qty >= len(opts_qty):
+                idx_qty = 0
 
             qty_type = c5.selectbox(
                 "Unit", opts_qty, index=idx_qty, key=f"{key_prefix}_qty_type"
@@ -215,7 +349,11 @@ def show_english_page():
     with tab1:
         left_col, right_col = st.columns([1.2, 1])
 
-        with left_col:
+        @st.fragment
+        def _edit_strategy_fragment():
+            # editor widget interactions rerun only this fragment; the
+            # save button still does a full rerun so the JSON view on
+            # the right refreshes
             st.subheader("📝 Edit Strategy")
 
             # Main Ticker input
@@ -234,62 +372,79 @@ def show_english_page():
                 else:
                     st.caption(f"Creating a new strategy for **[{main_ticker}]**.")
 
-                # Portfolio Weight Input
-                def_weight = current_data.get("portfolio_weight", 0.0)
-                portfolio_weight = st.slider(
-                    "Target Portfolio Weight (for Rebalancing)",
-                    0.0,
-                    1.0,
-                    float(def_weight),
-                    step=0.01,
-                    key=f"en_weight_{main_ticker}",
-                )
+                # one form so edits batch into a single rerun on save
+                # instead of one rerun per widget change
+                with st.form(f"en_edit_{main_ticker}"):
+                    # Portfolio Weight Input
+                    def_weight = current_data.get("portfolio_weight", 0.0)
+                    portfolio_weight = st.slider(
+                        "Target Portfolio Weight (for Rebalancing)",
+                        0.0,
+                        1.0,
+                        float(def_weight),
+                        step=0.01,
+                        key=f"en_weight_{main_ticker}",
+                    )
 
-                tab_buy, tab_sell = st.tabs(["🔵 Buy", "🔴 Sell"])
+                    tab_buy, tab_sell = st.tabs(["🔵 Buy", "🔴 Sell"])
 
-                # Pass saved_data to the form function to apply presets
-                with tab_buy:
-                    buy_strategy = input_strategy_details(
-                        f"buy_{main_ticker}_en",
-                        main_ticker,
-                        saved_data=current_data.get("buy"),
-                        allowed_qty_types=["count", "percent", "value", "split"],
-                    )
+                    # Pass saved_data to the form function to apply presets
+                    with tab_buy:
+                        buy_strategy = input_strategy_details(
+                            f"buy_{main_ticker}_en",
+                            main_ticker,
+                            saved_data=current_data.get("buy"),
+                            allowed_qty_types=["count", "percent", "value", "split"],
+                        )
 
-                with tab_sell:
-                    sell_strategy = input_strategy_details(
-                        f"sell_{main_ticker}_en",
-                        main_ticker,
-                        saved_data=current_data.get("sell"),
-                        allowed_qty_types=["count", "percent", "value"],
-                    )
+                    with tab_sell:
+                        sell_strategy = input_strategy_details(
+                            f"sell_{main_ticker}_en",
+                            main_ticker,
+                            saved_data=current_data.get("sell"),
+                            allowed_qty_types=["count", "percent", "value"],
+                        )
 
-                # Save/Update button
-                btn_label = "💾 Save Changes" if current_data else "➕ Add Strategy"
-                if st.button(
-                    btn_label, use_container_width=True, key=f"en_save_{main_ticker}"
-                ):
-                    st.session_state["strategies"][main_ticker] = {
+                    # Save/Update button
+                    btn_label = (
+                        "💾 Save Changes" if current_data else "➕ Add Strategy"
+                    )
+                    saved = st.form_submit_button(
+                        btn_label, use_container_width=True
+                    )
+                if saved:
+                    new_entry = {
                         "buy": buy_strategy,
                         "sell": sell_strategy,
                         "portfolio_weight": portfolio_weight,
                     }
+                    # replace the dict instead of mutating it in place so
+                    # caches keyed on it see a new object, never a stale
+                    # hash of a mutated one
+                    st.session_state["strategies"] = {
+                        **st.session_state["strategies"],
+                        main_ticker: new_entry,
+                    }
+                    # strategies diverged from the applied file, so the
+                    # upload short-circuit must not refuse a re-apply
+                    st.session_state.pop("_upload_hash", None)
                     st.success(f"[{main_ticker}] strategy has been updated!")
                     # Rerun to update the JSON view
                     st.rerun()
 
+        with left_col:
+            _edit_strategy_fragment()
+
         with right_col:
             st.subheader("💻 Current JSON Data")
 
             if st.session_state["strategies"]:
-                json_str = json.dumps(
-                    st.session_state["strategies"], indent=4, ensure_ascii=False
-                )
+                json_str = _strategies_json(st.session_state["strategies"])
                 st.code(json_str, language="json")
 
                 st.download_button(
                     label="Download JSON File",
-                    data=json_str,
+                    data=_strategies_json_bytes(st.session_state["strategies"]),
                     file_name="trading_strategies.json",
                     mime="application/json",
                     key="en_download",
@@ -313,30 +468,17 @@ def show_english_page():
                     "Start Backtest!", use_container_width=True
                 )
                 if run_button:
-                    stocks = []
-                    for ticker in st.session_state["strategies"]:
-                        stocks.append(
-                            Stock(
-                                ticker,
-                                start.strftime("%Y-%m-%d"),
-                                end.strftime("%Y-%m-%d"),
-                            )
-                        )
-                    strategy = StrategyManager(
-                        "strategy", StrategyWrapper(**st.session_state["strategies"])
+                    st.session_state["backtest"] = _run_backtest(
+                        _strategies_json(st.session_state["strategies"]),
+                        start.strftime("%Y-%m-%d"),
+                        end.strftime("%Y-%m-%d"),
+                        initial_cash,
                     )
-                    backtest = Backtest(stocks, [strategy], initial_cash)
-                    backtest.run()
-                    st.session_state["backtest"] = backtest
             if "backtest" in st.session_state and st.session_state["backtest"]:
                 with st.container(border=True):
                     st.subheader("Trade History")
                     backtest = st.session_state["backtest"]
-                    for ticker in backtest.trades:
-                        trade_data = pd.DataFrame(backtest.trades[ticker])
-                        trade_data["value"] = (
-                            trade_data["quantity"] * trade_data["price"]
-                        )
+                    for trade_data in _trade_frames(backtest):
                         st.dataframe(
                             trade_data,
                             column_config={
@@ -353,18 +495,7 @@ def show_english_page():
                         {"CASH": backtest.portfolio.cash}
                         | backtest.portfolio.stock_count
                     )
-                    st.subheader("Portfolio Value at a Specific Point in Time")
-                    date = st.slider(
-                        "date",
-                        start,
-                        end,
-                        end,
-                        label_visibility="hidden",
-                        key="en_slider",
-                    )
-                    st.markdown(
-                        f"Value at {date}: **${backtest.get_protfolio_value(date.strftime('%Y-%m-%d')):,.2f}**"
-                    )
+                    _portfolio_value_slider(backtest, start, end)
 
                     st.subheader("Monthly Portfolio Snapshot")
                     monthly_df = backtest.get_monthly_snapshots()
@@ -379,4 +510,4 @@ def show_english_page():
                 final_value = backtest.get_protfolio_value(end.strftime("%Y-%m-%d"))
                 profit_rate = final_value / initial_cash
                 st.markdown(f"## Final Profit Rate: {profit_rate:.3f}")
-                st.pyplot(backtest.plot_performance(instance_show=False))
+                st.pyplot(_performance_figure(backtest, id(backtest)))
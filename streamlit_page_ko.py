@@ -8,6 +8,13 @@ from pybacktest.models import Stock
 from pybacktest.strategy import StrategyManager, StrategyWrapper
 
 
+@st.cache_resource(show_spinner=False)
+def _performance_figure(_backtest: Backtest, run_key: int):
+    # keyed by the backtest identity so unrelated widget changes reuse
+    # the figure instead of re-running matplotlib
+    return _backtest.plot_performance(instance_show=False)
+
+
 def show_korean_page():
     # 페이지 기본 설정
     st.title("📈 주식 자동매매 전략")
@@ -355,9 +362,12 @@ def show_korean_page():
                         label_visibility="hidden",
                         key="kr_slider",
                     )
-                    st.markdown(
-                        f"Value at {date}: **${backtest.get_protfolio_value(date.strftime('%Y-%m-%d')):,.2f}**"
-                    )
+                    # equity curve is precomputed by run(); the slider is
+                    # an O(1) lookup instead of a revaluation per change
+                    point_value = backtest.equity_curve().asof(pd.Timestamp(date))
+                    if pd.isna(point_value):
+                        point_value = backtest.portfolio.initial_capital
+                    st.markdown(f"Value at {date}: **${point_value:,.2f}**")
 
                     st.subheader("월별 포트폴리오 현황")
                     monthly_df = backtest.get_monthly_snapshots()
@@ -371,4 +381,4 @@ def show_korean_page():
                 final_value = backtest.get_protfolio_value(end.strftime("%Y-%m-%d"))
                 profit_rate = final_value / initial_cash
                 st.markdown(f"## 최종 이익률: {profit_rate:.3f}")
-                st.pyplot(backtest.plot_performance(instance_show=False))
+                st.pyplot(_performance_figure(backtest, id(backtest)))
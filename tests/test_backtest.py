@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 from src.pybacktest.backtest import Backtest
 from src.pybacktest.models import Stock, Action, Portfolio
@@ -70,13 +71,15 @@ def test_strategy():
     strategy = StrategyManager("AAPL and TQQQ", StrategyWrapper.model_validate(test_data))
     stock_a = Stock('AAPL', start='2022-01-01', end='2022-01-10', fetch=False)
     dates = pd.date_range(start='2022-01-01', end='2022-01-10')
-    data_a = pd.DataFrame({'Close': [100, 102, 101, 103, 104, 105, 106, 107, 108, 500]}, index=dates)
-    data_a["Change"] = data_a - data_a.shift(1)
+    closes_a = np.array([100, 102, 101, 103, 104, 105, 106, 107, 108, 500], dtype=np.float64)
+    data_a = pd.DataFrame({'Close': closes_a}, index=dates)
+    data_a["Change"] = np.concatenate(([np.nan], np.diff(closes_a)))
     data_a["Change_Pct"] = data_a['Close'].pct_change()
     stock_a.data = data_a
     stock_b = Stock('TQQQ', start='2022-01-01', end='2022-01-10', fetch=False)
-    data_b = pd.DataFrame({'Close': [100, 102, 101, 103, 104, 105, 106, 107, 108, 109]}, index=dates)
-    data_b["Change"] = data_b - data_b.shift(1)
+    closes_b = np.array([100, 102, 101, 103, 104, 105, 106, 107, 108, 109], dtype=np.float64)
+    data_b = pd.DataFrame({'Close': closes_b}, index=dates)
+    data_b["Change"] = np.concatenate(([np.nan], np.diff(closes_b)))
     data_b["Change_Pct"] = data_b['Close'].pct_change()
     stock_b.data = data_b
     stocks = [stock_a, stock_b]